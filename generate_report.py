@@ -3,10 +3,8 @@ Generate a comprehensive report for the RSA project
 """
 
 import math
-from rsa_project import (
-    RSA_KEYS, calculate_private_key, measure_rsa_performance,
-    measure_factorization_performance, quadratic_sieve
-)
+from rsa_project import RSA_KEYS, calculate_private_key
+from results_cache import get_results
 
 
 def generate_report():
@@ -15,6 +13,8 @@ def generate_report():
     """
     report = []
     
+    rsa_results, factor_results = get_results()
+    
     report.append("# RSA Cryptography Project Report\n")
     report.append("## Overview\n")
     report.append("This report presents the results of RSA encryption/decryption performance analysis ")
@@ -32,7 +32,7 @@ def generate_report():
         q = key_data['q']
         N = key_data['N']
         e = key_data['e']
-        d = calculate_private_key(p, q, e)
+        d = rsa_results[key_name]['d']
         report.append(f"| {key_name} | {p} | {q} | {N} | {e} | {d} |\n")
     
     report.append("\n")
@@ -42,9 +42,6 @@ def generate_report():
     report.append("Performance measurements were conducted using a fixed message (12345) ")
     report.append("with 1000 repetitions for each key pair.\n\n")
     
-    message = 12345
-    rsa_results = measure_rsa_performance(RSA_KEYS, message, repetitions=1000)
-    
     report.append("### Timing Results\n\n")
     report.append("| Key | N (bits) | Encryption Time (us) | Decryption Time (us) |\n")
     report.append("|-----|----------|---------------------|---------------------|\n")
@@ -77,8 +74,6 @@ def generate_report():
     
     report.append("### Factorization Results\n\n")
     
-    factor_results = measure_factorization_performance(RSA_KEYS)
-    
     report.append("| Key | N | Recovered p | Recovered q | Factorization Time (s) |\n")
     report.append("|-----|---|-------------|-------------|----------------------|\n")
     
@@ -93,13 +88,11 @@ def generate_report():
     for key_name in RSA_KEYS.keys():
         fact = factor_results[key_name]
         key_data = RSA_KEYS[key_name]
-        p_expected = key_data['p']
-        q_expected = key_data['q']
         p_found = fact['p']
         q_found = fact['q']
         
-        # Verify private key
-        d_expected = calculate_private_key(p_expected, q_expected, key_data['e'])
+        # Verify private key (d from the known primes is already in rsa_results)
+        d_expected = rsa_results[key_name]['d']
         d_recovered = calculate_private_key(p_found, q_found, key_data['e'])
         
         report.append(f"- **{key_name}**: p * q = {p_found} * {q_found} = {p_found * q_found} = N [OK]\n")
@@ -0,0 +1,41 @@
+"""
+Cache RSA and factorization benchmark results shared by the reporting scripts
+"""
+
+import os
+import pickle
+from typing import Dict, Tuple
+from rsa_project import RSA_KEYS, measure_rsa_performance, measure_factorization_performance
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'rsa_results.pkl')
+
+
+def get_results(force: bool = False, message: int = 12345,
+                repetitions: int = 1000) -> Tuple[Dict, Dict]:
+    """
+    Return (rsa_results, factor_results) for RSA_KEYS
+    Results are computed once and pickled to .cache/rsa_results.pkl; the cache
+    is reused while the keys, message and repetitions match. Pass force=True
+    to recompute.
+    """
+    cache_key = (RSA_KEYS, message, repetitions)
+    
+    if not force and os.path.exists(CACHE_FILE):
+        try:
+            with open(CACHE_FILE, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['key'] == cache_key:
+                print(f"Using cached results from {CACHE_FILE}")
+                return cached['rsa_results'], cached['factor_results']
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+    
+    rsa_results = measure_rsa_performance(RSA_KEYS, message, repetitions=repetitions)
+    factor_results = measure_factorization_performance(RSA_KEYS)
+    
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    with open(CACHE_FILE, 'wb') as f:
+        pickle.dump({'key': cache_key, 'rsa_results': rsa_results,
+                     'factor_results': factor_results}, f)
+    
+    return rsa_results, factor_results